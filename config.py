@@ -4,12 +4,20 @@ This module provides centralized configuration management and shared
 functions for both indexer.py and search.py.
 """
 
+import functools
+import hashlib
 import os
+import platform
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
 from dotenv import load_dotenv
-from llama_index.embeddings.huggingface import HuggingFaceEmbedding
-import torch
+
+# torch and LlamaIndex are imported inside the functions that need them so
+# that search.py can talk to the search server without paying their import
+# cost.
+if TYPE_CHECKING:
+    from llama_index.embeddings.huggingface import HuggingFaceEmbedding
 
 # Load environment variables from .env file
 load_dotenv()
@@ -22,7 +30,34 @@ COLLECTION_NAME = "obsidian_notes"
 CHUNK_SIZE = 512
 CHUNK_OVERLAP = 50
 EMBEDDING_MODEL = "google/embeddinggemma-300m"
+FULL_EMBED_DIM = 768
+MATRYOSHKA_DIMS = (128, 256, 512, 768)  # truncation sizes the model is trained for
+EMBED_DIM = os.getenv("EMBED_DIM", "256")  # stored dimensions for new indexes
+EMBED_DIM_METADATA_KEY = "mrl_dim"  # collection metadata key recording EMBED_DIM
 DEFAULT_TOP_K = 5
+INSERT_BATCH_SIZE = 200  # chunks embedded and written to ChromaDB per call
+HNSW_BATCH_SIZE = 1000  # vectors buffered before being added to the HNSW graph
+HNSW_SYNC_THRESHOLD = 10000  # vectors added between HNSW index writes to disk
+MANIFEST_FILE = "indexed_files.json"  # in DB_PATH; written after every build
+CACHE_DIR = Path(os.getenv("CACHE_DIR", str(Path.home() / ".cache" / "gemini-rag")))
+
+# Search server (see search_server.py)
+SEARCH_SERVER = os.getenv("SEARCH_SERVER", "0") == "1"  # auto-start on first query
+SEARCH_SERVER_IDLE_TIMEOUT = 1800  # seconds before an idle server exits
+SEARCH_SERVER_TIMEOUT = 30  # seconds search.py waits for a server response
+
+# Performance tuning (opt-in via environment variables)
+QUANTIZE = os.getenv("QUANTIZE", "0") == "1"  # INT8 dynamic quantization on CPU
+EMBED_BACKEND = os.getenv("EMBED_BACKEND", "torch")  # "torch" or "onnx"
+ONNX_MODEL_DIR = CACHE_DIR / "embeddinggemma-onnx"
+ONNX_QUANTIZED_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+EMBED_BATCH_SIZE = os.getenv("EMBED_BATCH_SIZE")  # default depends on device
+HALF_PRECISION = os.getenv("HALF_PRECISION", "1") == "1"  # bfloat16 on MPS
+TORCH_COMPILE = os.getenv("TORCH_COMPILE", "0") == "1"  # torch.compile the model
+# Padded token lengths; short queries get small buckets, document chunks land
+# in the largest. Batches longer than CHUNK_SIZE keep their natural length, so
+# one oversized chunk never pads a whole batch to twice its size.
+SEQUENCE_BUCKETS = (32, 64, 128, 256, CHUNK_SIZE)
 
 
 def validate_configuration() -> None:
@@ -44,6 +79,9 @@ def validate_configuration() -> None:
         errors.append("HF_TOKEN is not set in .env file")
         errors.append("Get your token from: https://huggingface.co/settings/tokens")
 
+    if not EMBED_DIM.isdigit() or int(EMBED_DIM) not in MATRYOSHKA_DIMS:
+        errors.append(f"EMBED_DIM must be one of {MATRYOSHKA_DIMS}, got {EMBED_DIM}")
+
     if errors:
         print("Configuration Error:", file=sys.stderr)
         for error in errors:
@@ -52,36 +90,355 @@ def validate_configuration() -> None:
         sys.exit(1)
 
 
+def get_embed_dim() -> int:
+    """Return the number of embedding dimensions to store in new indexes.
+
+    Returns:
+        EMBED_DIM as an integer (validated by validate_configuration()).
+    """
+    return int(EMBED_DIM)
+
+
+def get_collection_embed_dim(chroma_collection: Any) -> int:
+    """Return the embedding dimension an existing collection was built with.
+
+    Args:
+        chroma_collection: ChromaDB collection.
+
+    Returns:
+        Dimension recorded at index time, or FULL_EMBED_DIM for indexes built
+        before truncation was introduced.
+    """
+    metadata = chroma_collection.metadata or {}
+    return int(metadata.get(EMBED_DIM_METADATA_KEY, FULL_EMBED_DIM))
+
+
+def get_db_key(db_path: str) -> str:
+    """Return a short stable key identifying a database directory.
+
+    Per-database files in CACHE_DIR (query cache, search server socket) are
+    named after this key so that different databases never share them.
+
+    Args:
+        db_path: Path to ChromaDB database directory.
+
+    Returns:
+        First 12 hex digits of the SHA-1 of the absolute database path.
+    """
+    return hashlib.sha1(os.path.abspath(db_path).encode("utf-8")).hexdigest()[:12]
+
+
+def get_search_socket_path(db_path: str) -> Path:
+    """Return the UNIX socket path of the search server for a database.
+
+    Args:
+        db_path: Path to ChromaDB database directory.
+
+    Returns:
+        Socket path inside CACHE_DIR.
+    """
+    return CACHE_DIR / f"search-{get_db_key(db_path)}.sock"
+
+
 def get_device() -> str:
     """Detect and return appropriate device for Apple Silicon or CPU.
 
     Returns:
         Device string: "mps" for Apple Silicon, "cpu" otherwise.
     """
+    import torch
+
     if torch.backends.mps.is_available():
         return "mps"
     return "cpu"
 
 
-def setup_embedding_model(verbose: bool = False) -> HuggingFaceEmbedding:
+def _total_memory_bytes() -> int:
+    """Return total physical memory in bytes, or 0 if it cannot be determined."""
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (ValueError, OSError, AttributeError):
+        return 0
+
+
+def get_embed_batch_size(device: str) -> int:
+    """Return the number of texts embedded per forward pass.
+
+    Args:
+        device: Device selected by get_device().
+
+    Returns:
+        EMBED_BATCH_SIZE if set, otherwise 128 on MPS machines with more than
+        16GB of memory and 64 elsewhere.
+    """
+    if EMBED_BATCH_SIZE:
+        return int(EMBED_BATCH_SIZE)
+    if device == "mps" and _total_memory_bytes() > 16 * 1024**3:
+        return 128
+    return 64
+
+
+def _use_onnx_backend(device: str) -> bool:
+    """Check whether the quantized ONNX Runtime backend should be used.
+
+    Args:
+        device: Device selected by get_device().
+
+    Returns:
+        True if EMBED_BACKEND=onnx and running on an x86 CPU.
+    """
+    return (
+        EMBED_BACKEND == "onnx"
+        and device == "cpu"
+        and platform.machine() in ("x86_64", "AMD64")
+    )
+
+
+def _export_onnx_model() -> Path:
+    """Export the embedding model to ONNX and quantize it for AVX-512 VNNI.
+
+    The export runs once; later calls reuse the model cached in ONNX_MODEL_DIR.
+    Progress is always reported on stderr because the export takes minutes.
+
+    Returns:
+        Path to the directory containing the exported model.
+    """
+    if (ONNX_MODEL_DIR / ONNX_QUANTIZED_FILE).exists():
+        return ONNX_MODEL_DIR
+
+    # Imported lazily: only needed once, and requires optimum[onnxruntime]
+    from sentence_transformers import (
+        SentenceTransformer,
+        export_dynamic_quantized_onnx_model,
+    )
+
+    print(f"Exporting ONNX model to: {ONNX_MODEL_DIR}", file=sys.stderr)
+
+    model = SentenceTransformer(EMBEDDING_MODEL, backend="onnx", device="cpu")
+    model.save(str(ONNX_MODEL_DIR))
+    export_dynamic_quantized_onnx_model(model, "avx512_vnni", str(ONNX_MODEL_DIR))
+
+    return ONNX_MODEL_DIR
+
+
+def _mps_supports_bfloat16() -> bool:
+    """Check whether the MPS backend can run bfloat16 (macOS 14 or later).
+
+    Returns:
+        True if a small bfloat16 computation succeeds on MPS.
+    """
+    import torch
+
+    try:
+        probe = torch.ones(2, device="mps").to(torch.bfloat16)
+        (probe * probe).sum().item()
+    except (RuntimeError, TypeError):
+        return False
+    return True
+
+
+def _quantize_model(embed_model: "HuggingFaceEmbedding") -> None:
+    """Quantize the Linear layers of the embedding model to INT8 in place.
+
+    Weights are stored as INT8 and activations are quantized on the fly,
+    which halves weight bandwidth and enables INT8 GEMM kernels on CPU.
+
+    Args:
+        embed_model: Embedding model loaded on the CPU device.
+    """
+    import torch
+
+    # torch.quantization is a deprecated alias of torch.ao.quantization, and
+    # recent torch releases also warn that eager-mode quantization is being
+    # superseded by torchao; it still works, so the warning is harmless
+    torch.ao.quantization.quantize_dynamic(
+        embed_model._model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+    )
+
+
+def _pad_to_bucket(features: Dict[str, Any], tokenizer: Any) -> Dict[str, Any]:
+    """Pad tokenized inputs to the next length in SEQUENCE_BUCKETS.
+
+    Keeps the set of input shapes small so shape-specialized kernels can be
+    reused across batches instead of being rebuilt for every length.
+
+    Args:
+        features: Tokenizer output (input_ids, attention_mask, ...).
+        tokenizer: Tokenizer that produced the features.
+
+    Returns:
+        Features padded to the bucket length (unchanged if already longer
+        than the largest bucket).
+    """
+    import torch
+
+    length = features["input_ids"].shape[1]
+    bucket = next((size for size in SEQUENCE_BUCKETS if size >= length), length)
+    if bucket == length:
+        return features
+
+    padding = bucket - length
+    pad = (padding, 0) if tokenizer.padding_side == "left" else (0, padding)
+    fill_values = {"input_ids": tokenizer.pad_token_id, "attention_mask": 0}
+
+    for key, value in features.items():
+        if isinstance(value, torch.Tensor) and value.dim() == 2:
+            fill = fill_values.get(key, 0)
+            features[key] = torch.nn.functional.pad(value, pad, value=fill)
+
+    return features
+
+
+def _enable_bucket_padding(embed_model: "HuggingFaceEmbedding") -> None:
+    """Make the model's tokenizer pad every batch to a SEQUENCE_BUCKETS length.
+
+    Args:
+        embed_model: Embedding model whose first module is a Transformer.
+    """
+    transformer = embed_model._model[0]
+    tokenize = transformer.tokenize
+
+    def tokenize_bucketed(texts: Any, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        return _pad_to_bucket(tokenize(texts, *args, **kwargs), transformer.tokenizer)
+
+    transformer.tokenize = tokenize_bucketed
+
+
+def _compile_model(embed_model: "HuggingFaceEmbedding") -> bool:
+    """Compile the model's transformer with torch.compile.
+
+    Only the underlying Hugging Face model is compiled; the SentenceTransformer
+    wrapper must stay uncompiled because LlamaIndex calls its encode() method.
+    Inputs are padded to fixed bucket lengths so compiled graphs are reused.
+
+    Args:
+        embed_model: Embedding model using the PyTorch backend.
+
+    Returns:
+        True if the model was compiled, False if torch is older than 2.1.
+    """
+    import torch
+
+    major, minor = (int(part) for part in torch.__version__.split(".")[:2])
+    if (major, minor) < (2, 1):
+        return False
+
+    transformer = embed_model._model[0]
+    transformer.auto_model = torch.compile(transformer.auto_model, dynamic=False)
+    _enable_bucket_padding(embed_model)
+    return True
+
+
+@functools.lru_cache(maxsize=1)
+def _load_embedding_model(
+    embed_dim: Optional[int],
+) -> Tuple["HuggingFaceEmbedding", Tuple[str, ...]]:
+    """Load and configure the embedding model (cached, see setup_embedding_model).
+
+    Args:
+        embed_dim: Number of dimensions to keep, or None for all of them.
+
+    Returns:
+        Tuple of (model, status messages describing the applied options).
+    """
+    import torch
+    from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+
+    device = get_device()
+    use_onnx = _use_onnx_backend(device)
+    embed_batch_size = get_embed_batch_size(device)
+    messages = []
+
+    # HF_TOKEN is automatically read from environment by HuggingFace libraries
+    if use_onnx:
+        embed_model = HuggingFaceEmbedding(
+            model_name=str(_export_onnx_model()),
+            device=device,
+            embed_batch_size=embed_batch_size,
+            backend="onnx",
+            model_kwargs={"file_name": ONNX_QUANTIZED_FILE},
+        )
+        # ONNX Runtime caches memory plans per input shape, so a few fixed
+        # shapes avoid re-planning for every batch length
+        _enable_bucket_padding(embed_model)
+        messages.append("Using INT8 ONNX Runtime backend")
+    else:
+        embed_model = HuggingFaceEmbedding(
+            model_name=EMBEDDING_MODEL,
+            device=device,
+            embed_batch_size=embed_batch_size,
+        )
+
+    # Dynamic quantization only has CPU kernels, so MPS keeps full precision
+    quantized = QUANTIZE and device == "cpu" and not use_onnx
+    if quantized:
+        _quantize_model(embed_model)
+        messages.append("Applied INT8 dynamic quantization")
+
+    # EmbeddingGemma activations overflow in float16, so use bfloat16 instead
+    if HALF_PRECISION and device == "mps":
+        if _mps_supports_bfloat16():
+            embed_model._model.to(torch.bfloat16)
+            messages.append("Using bfloat16 weights on MPS")
+        else:
+            messages.append("bfloat16 requires macOS 14+ on MPS; using float32")
+
+    if TORCH_COMPILE and not use_onnx and not quantized:
+        compiled = _compile_model(embed_model)
+        status = "enabled" if compiled else "skipped (requires torch>=2.1)"
+        messages.append(f"torch.compile {status}")
+
+    if embed_dim is not None:
+        embed_model._model.truncate_dim = embed_dim
+        messages.append(f"Embedding dimensions: {embed_dim}")
+
+    return embed_model, tuple(messages)
+
+
+def setup_embedding_model(
+    verbose: bool = False, embed_dim: Optional[int] = None
+) -> "HuggingFaceEmbedding":
     """Initialize and return HuggingFaceEmbedding model.
 
+    Set QUANTIZE=1 to apply INT8 dynamic quantization when running on CPU.
+    Set EMBED_BACKEND=onnx to run an INT8 ONNX Runtime model on x86 CPUs
+    instead, with inputs padded to fixed bucket lengths; other platforms fall
+    back to the PyTorch backend. On MPS the model runs in bfloat16 unless
+    HALF_PRECISION=0 or the OS is too old to support it (macOS 13 and
+    earlier fall back to float32). Set TORCH_COMPILE=1 to compile the PyTorch
+    model (skipped for ONNX and INT8-quantized models).
+
+    EmbeddingGemma is trained with Matryoshka representation learning, so the
+    leading embed_dim dimensions of its output form a valid embedding on their
+    own. Embeddings are truncated before being L2-normalized.
+
+    The model is loaded once per process: later calls with the same embed_dim
+    return the same shared instance, so callers must not mutate it. Verbose
+    output reports whether the model was loaded or reused.
+
     Args:
         verbose: If True, print device information.
+        embed_dim: Number of dimensions to keep (default: full 768).
 
     Returns:
         Configured HuggingFaceEmbedding instance.
     """
-    device = get_device()
+    # None and 768 both mean "no truncation"; normalize so they share a cache entry
+    if embed_dim is not None and embed_dim >= FULL_EMBED_DIM:
+        embed_dim = None
 
-    if verbose:
-        print(f"Using device: {device}", file=sys.stderr)
-        print(f"Loading embedding model: {EMBEDDING_MODEL}", file=sys.stderr)
+    misses = _load_embedding_model.cache_info().misses
+    embed_model, messages = _load_embedding_model(embed_dim)
+    loaded = _load_embedding_model.cache_info().misses > misses
 
-    # HF_TOKEN is automatically read from environment by HuggingFace libraries
-    embed_model = HuggingFaceEmbedding(model_name=EMBEDDING_MODEL, device=device)
-
-    if verbose:
-        print("Embedding model loaded successfully", file=sys.stderr)
+    if verbose and loaded:
+        device = get_device()
+        print(f"Using device: {device}", file=sys.stderr)
+        print(f"Loaded embedding model: {EMBEDDING_MODEL}", file=sys.stderr)
+        print(f"Embedding batch size: {get_embed_batch_size(device)}", file=sys.stderr)
+        for message in messages:
+            print(message, file=sys.stderr)
+    elif verbose:
+        print(f"Reusing loaded embedding model: {EMBEDDING_MODEL}", file=sys.stderr)
 
     return embed_model
@@ -6,23 +6,40 @@ local model, and stores them for semantic search.
 
 Usage:
     python3 indexer.py --full
+    python3 indexer.py --incremental
 """
 
 import sys
 import os
 import argparse
+import json
+import mmap
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Tuple
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
 
 from llama_index.core import (
-    VectorStoreIndex,
     SimpleDirectoryReader,
     Settings,
     Document,
-    StorageContext,
 )
-from llama_index.vector_stores.chroma import ChromaVectorStore
+from llama_index.core.embeddings import BaseEmbedding
+from llama_index.core.schema import BaseNode, MetadataMode
+from llama_index.core.vector_stores.utils import node_to_metadata_dict
+from llama_index.readers.file import MarkdownReader
 import chromadb
+from tqdm import tqdm
 
 from config import (
     VAULT_PATH,
@@ -30,9 +47,19 @@ from config import (
     COLLECTION_NAME,
     CHUNK_SIZE,
     CHUNK_OVERLAP,
+    EMBED_DIM_METADATA_KEY,
+    INSERT_BATCH_SIZE,
+    HNSW_BATCH_SIZE,
+    HNSW_SYNC_THRESHOLD,
+    MANIFEST_FILE,
     validate_configuration,
+    get_collection_embed_dim,
+    get_embed_dim,
     setup_embedding_model,
 )
+from query_cache import QueryCache
+
+MMAP_MIN_BYTES = 4096  # smaller files are read directly (mmap has fixed setup cost)
 
 
 def parse_arguments() -> argparse.Namespace:
@@ -44,24 +71,22 @@ def parse_arguments() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Build vector index from Obsidian vault"
     )
-    parser.add_argument(
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument(
         "--full",
         action="store_true",
-        help="Perform full index rebuild (required for now; incremental mode coming soon)",
+        help="Perform full index rebuild",
+    )
+    mode.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only re-index new or modified files and drop deleted ones",
     )
 
-    args = parser.parse_args()
-
-    # Validate that --full is provided
-    if not args.full:
-        parser.error("--full flag is required (incremental mode not yet implemented)")
-
-    return args
+    return parser.parse_args()
 
 
-def setup_vector_store(
-    db_path: str, reset: bool = False
-) -> Tuple[chromadb.ClientAPI, ChromaVectorStore]:
+def setup_vector_store(db_path: str, reset: bool = False) -> chromadb.Collection:
     """Setup ChromaDB vector store.
 
     Args:
@@ -69,7 +94,7 @@ def setup_vector_store(
         reset: If True, delete existing collection and create new one.
 
     Returns:
-        Tuple of (ChromaDB client, ChromaVectorStore instance).
+        ChromaDB collection holding the index.
     """
     # Create persistent ChromaDB client
     chroma_client = chromadb.PersistentClient(path=db_path)
@@ -83,66 +108,358 @@ def setup_vector_store(
             # Collection doesn't exist, which is fine
             pass
 
-    # Get or create collection
-    chroma_collection = chroma_client.get_or_create_collection(name=COLLECTION_NAME)
+    # Reuse an existing collection as-is so its settings are not overwritten
+    try:
+        chroma_collection = chroma_client.get_collection(name=COLLECTION_NAME)
+    except Exception:
+        # Create collection. ChromaDB rewrites the whole HNSW index to disk
+        # every sync_threshold additions; the defaults (100/1000) make bulk
+        # inserts into large collections spend most of their time persisting.
+        # The embedding dimension is recorded so search uses the same one.
+        chroma_collection = chroma_client.create_collection(
+            name=COLLECTION_NAME,
+            metadata={
+                "hnsw:batch_size": HNSW_BATCH_SIZE,
+                "hnsw:sync_threshold": HNSW_SYNC_THRESHOLD,
+                EMBED_DIM_METADATA_KEY: get_embed_dim(),
+            },
+        )
+
+    return chroma_collection
+
+
+def scan_markdown_files(vault_path: str) -> Dict[str, float]:
+    """Walk the vault once and collect markdown files with their mtimes.
+
+    Uses os.scandir so directory listing and stat results come from a single
+    pass. Hidden files and directories (including .obsidian) are skipped,
+    matching SimpleDirectoryReader's defaults. Symlinked directories are not
+    followed, since a link back to an ancestor would recurse forever.
+
+    Args:
+        vault_path: Path to Obsidian vault directory.
+
+    Returns:
+        Mapping of absolute file path to modification time.
+    """
+    mtimes = {}
+    pending = [vault_path]
+
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.name.endswith(".md") and entry.is_file():
+                    mtimes[os.path.abspath(entry.path)] = entry.stat().st_mtime
+
+    return mtimes
+
 
-    # Create vector store
-    vector_store = ChromaVectorStore(chroma_collection=chroma_collection)
+def read_text_file(file_path: str) -> str:
+    """Read a UTF-8 text file, memory-mapping it if it is large.
 
-    return chroma_client, vector_store
+    Args:
+        file_path: Path to the file.
+
+    Returns:
+        Decoded file contents; invalid UTF-8 bytes are replaced.
+    """
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < MMAP_MIN_BYTES:
+            data = f.read()
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                data = mapped[:]
+    return data.decode("utf-8", errors="replace")
+
+
+class MmapMarkdownReader(MarkdownReader):
+    """MarkdownReader that reads files with read_text_file().
+
+    Parsing (header splitting, link and image removal) is unchanged; only
+    file access bypasses the fsspec filesystem layer, which adds buffered
+    wrapper overhead for every one of the vault's many small files.
+    """
 
+    def parse_tups(
+        self, filepath: Any, errors: str = "ignore", fs: Optional[Any] = None
+    ) -> List[Tuple[Optional[str], str]]:
+        """Read a markdown file and split it into (header, text) tuples.
 
-def load_documents(vault_path: str) -> List[Document]:
-    """Load documents from Obsidian vault with progress bar.
+        Args:
+            filepath: Path to the markdown file.
+            errors: Unused; kept for MarkdownReader compatibility.
+            fs: Unused; vault files are always read from the local disk.
+
+        Returns:
+            List of (header, text) tuples.
+        """
+        content = read_text_file(str(filepath))
+        if self._remove_hyperlinks:
+            content = self.remove_hyperlinks(content)
+        if self._remove_images:
+            content = self.remove_images(content)
+        return self.markdown_to_tups(content)
+
+
+def iter_documents(vault_path: str, mtimes: Dict[str, float]) -> Iterator[Document]:
+    """Stream documents from the Obsidian vault one file at a time.
+
+    Only the documents of the file currently being read are held in memory,
+    so the corpus is never materialized as a whole. Files are read lazily as
+    the returned iterator is consumed.
 
     Args:
         vault_path: Path to Obsidian vault directory.
+        mtimes: Files to load, as returned by scan_markdown_files().
 
     Returns:
-        List of Document objects.
+        Iterator of Document objects with modified_time metadata.
     """
     print(f"Loading documents from: {vault_path}", file=sys.stderr)
 
-    # Create reader with filters for markdown files
+    if not mtimes:
+        return iter(())
+
+    # Read exactly the scanned files so the reader does not walk the vault again
     reader = SimpleDirectoryReader(
-        input_dir=vault_path,
-        recursive=True,
-        required_exts=[".md"],
-        exclude=["**/.obsidian/**"],  # Exclude Obsidian config directory
+        input_files=sorted(mtimes),
+        file_extractor={".md": MmapMarkdownReader()},
         filename_as_id=True,
     )
 
-    # Load documents with built-in progress bar
-    documents = reader.load_data(show_progress=True)
+    # The progress bar counts files read, including ones without documents
+    return _set_modified_times(reader.iter_data(show_progress=True), mtimes)
+
 
-    # Add metadata (filepath and modification time)
+def _set_modified_times(
+    file_documents: Iterable[List[Document]], mtimes: Dict[str, float]
+) -> Iterator[Document]:
+    """Add modification times from the scan results to streamed documents.
+
+    Args:
+        file_documents: Documents grouped per file, from iter_data().
+        mtimes: Mapping of absolute file path to modification time.
+
+    Yields:
+        Each document with modified_time metadata.
+    """
+    for documents in file_documents:
+        for doc in documents:
+            if hasattr(doc, "metadata") and "file_path" in doc.metadata:
+                file_path = os.path.abspath(doc.metadata["file_path"])
+                if file_path in mtimes:
+                    doc.metadata["modified_time"] = mtimes[file_path]
+            yield doc
+
+
+class NodeColumns(NamedTuple):
+    """Parallel per-chunk columns in the layout ChromaDB's add() expects."""
+
+    ids: List[str]
+    embed_texts: List[str]
+    documents: List[str]
+    metadatas: List[Dict[str, Any]]
+
+
+def nodes_to_columns(nodes: List[BaseNode]) -> NodeColumns:
+    """Convert nodes into parallel columns ready to be batched.
+
+    Metadata is serialized the same way ChromaVectorStore does it, so the
+    search side can rebuild nodes from what is stored.
+
+    Args:
+        nodes: Chunked nodes to index.
+
+    Returns:
+        NodeColumns with one entry per node.
+    """
+    columns = NodeColumns([], [], [], [])
+    for node in nodes:
+        metadata = node_to_metadata_dict(node, remove_text=True, flat_metadata=True)
+        columns.ids.append(node.node_id)
+        columns.embed_texts.append(node.get_content(metadata_mode=MetadataMode.EMBED))
+        columns.documents.append(node.get_content(metadata_mode=MetadataMode.NONE))
+        columns.metadatas.append(
+            {key: "" if value is None else value for key, value in metadata.items()}
+        )
+    return columns
+
+
+def iter_node_batches(
+    documents: Iterable[Document], batch_size: int = INSERT_BATCH_SIZE
+) -> Iterator[List[BaseNode]]:
+    """Chunk streamed documents and regroup the chunks into fixed-size batches.
+
+    Args:
+        documents: Documents to chunk.
+        batch_size: Number of nodes per batch (default: 200).
+
+    Yields:
+        Lists of at most batch_size nodes.
+    """
+    buffer: List[BaseNode] = []
     for doc in documents:
-        if hasattr(doc, "metadata") and "file_path" in doc.metadata:
-            file_path = doc.metadata["file_path"]
-            if os.path.exists(file_path):
-                doc.metadata["modified_time"] = os.path.getmtime(file_path)
+        buffer.extend(Settings.node_parser.get_nodes_from_documents([doc]))
+        while len(buffer) >= batch_size:
+            yield buffer[:batch_size]
+            buffer = buffer[batch_size:]
+    if buffer:
+        yield buffer
+
+
+def index_documents(
+    documents: Iterable[Document],
+    embed_model: BaseEmbedding,
+    chroma_collection: chromadb.Collection,
+    batch_size: int = INSERT_BATCH_SIZE,
+) -> Tuple[int, int]:
+    """Chunk, embed, and write documents to ChromaDB as a streaming pipeline.
+
+    Documents are chunked as they arrive and each batch of nodes is converted
+    to parallel columns, embedded, written, and dropped, so peak memory is
+    bounded by the batch size rather than the vault size. Each ChromaDB insert
+    carries a whole batch, which amortizes the per-call transaction overhead.
+    Inserts run on a background thread so writing one batch overlaps with
+    reading and embedding the next.
 
-    print(f"Loaded {len(documents)} documents", file=sys.stderr)
-    return documents
+    Args:
+        documents: Documents to index (typically from iter_documents()).
+        embed_model: Model used to generate embeddings.
+        chroma_collection: Destination collection.
+        batch_size: Number of nodes per embedding/insert call (default: 200).
 
+    Returns:
+        Tuple of (documents indexed, chunks indexed).
+    """
+    doc_count = 0
+    chunk_count = 0
+    pending = None
+
+    def counted(docs: Iterable[Document]) -> Iterator[Document]:
+        nonlocal doc_count
+        for doc in docs:
+            doc_count += 1
+            yield doc
+
+    # A single writer keeps inserts ordered and never contends for SQLite
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        for batch in iter_node_batches(counted(documents), batch_size):
+            columns = nodes_to_columns(batch)
+            embeddings = embed_model.get_text_embedding_batch(columns.embed_texts)
+
+            # Wait for the previous write so at most one batch is in flight
+            # and insert errors surface immediately
+            if pending is not None:
+                pending.result()
+            pending = executor.submit(
+                chroma_collection.add,
+                ids=columns.ids,
+                embeddings=embeddings,
+                documents=columns.documents,
+                metadatas=columns.metadatas,
+            )
+            chunk_count += len(columns.ids)
+
+        if pending is not None:
+            pending.result()
+
+    return doc_count, chunk_count
+
+
+def get_indexed_files(chroma_collection: chromadb.Collection) -> Dict[str, float]:
+    """Read the file path and modification time of every indexed chunk.
 
-def build_index_full(vault_path: str, db_path: str) -> None:
-    """Build full index with progress tracking.
+    Args:
+        chroma_collection: Collection to inspect.
+
+    Returns:
+        Mapping of absolute file path to the modification time it was
+        indexed with.
+    """
+    indexed = {}
+    page_size = 10000
+    offset = 0
+
+    while True:
+        page = chroma_collection.get(
+            include=["metadatas"], limit=page_size, offset=offset
+        )
+        for metadata in page["metadatas"]:
+            if metadata and "file_path" in metadata:
+                file_path = os.path.abspath(metadata["file_path"])
+                indexed[file_path] = metadata.get("modified_time")
+        if len(page["ids"]) < page_size:
+            return indexed
+        offset += page_size
+
+
+def load_manifest(db_path: str) -> Optional[Dict[str, float]]:
+    """Read the files recorded by the last completed index build.
 
     Args:
-        vault_path: Path to Obsidian vault.
-        db_path: Path to ChromaDB database.
+        db_path: Path to ChromaDB database directory.
+
+    Returns:
+        Mapping of absolute file path to modification time, or None if no
+        readable manifest exists (e.g. indexes built before it was added).
     """
-    print("Starting full index build...", file=sys.stderr)
-    print("=" * 60, file=sys.stderr)
+    try:
+        with open(os.path.join(db_path, MANIFEST_FILE), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if isinstance(manifest, dict) else None
 
-    # Step 1: Validate configuration
-    validate_configuration()
 
-    # Step 2: Setup embedding model
-    embed_model = setup_embedding_model(verbose=True)
+def save_manifest(db_path: str, mtimes: Dict[str, float]) -> None:
+    """Atomically record the files an index build has fully processed.
+
+    The manifest lists every scanned file, including ones that produce no
+    chunks (such as empty notes), which would otherwise never appear in the
+    collection and be re-indexed on every incremental run.
+
+    Args:
+        db_path: Path to ChromaDB database directory.
+        mtimes: Mapping of absolute file path to modification time.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=db_path, prefix=".manifest-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(mtimes, f, ensure_ascii=False)
+        os.replace(tmp_path, os.path.join(db_path, MANIFEST_FILE))
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def delete_files(chroma_collection: chromadb.Collection, file_paths: Set[str]) -> None:
+    """Delete all chunks belonging to the given files.
+
+    Args:
+        chroma_collection: Collection to delete from.
+        file_paths: Absolute paths of files whose chunks should be removed.
+    """
+    paths = sorted(file_paths)
+    for start in range(0, len(paths), INSERT_BATCH_SIZE):
+        batch = paths[start : start + INSERT_BATCH_SIZE]
+        chroma_collection.delete(where={"file_path": {"$in": batch}})
+
+
+def setup_indexing_model(embed_dim: int) -> BaseEmbedding:
+    """Load the embedding model and configure LlamaIndex settings.
+
+    Args:
+        embed_dim: Number of embedding dimensions stored in the collection.
+
+    Returns:
+        Embedding model used for indexing.
+    """
+    embed_model = setup_embedding_model(verbose=True, embed_dim=embed_dim)
 
-    # Step 3: Configure LlamaIndex settings
     Settings.embed_model = embed_model
     Settings.chunk_size = CHUNK_SIZE
     Settings.chunk_overlap = CHUNK_OVERLAP
@@ -151,43 +468,158 @@ def build_index_full(vault_path: str, db_path: str) -> None:
     print(f"Chunk overlap: {CHUNK_OVERLAP} tokens", file=sys.stderr)
     print("=" * 60, file=sys.stderr)
 
-    # Step 4: Setup vector store (reset existing data)
-    chroma_client, vector_store = setup_vector_store(db_path, reset=True)
+    return embed_model
+
 
-    # Step 5: Load documents (with progress bar)
-    documents = load_documents(vault_path)
+def diff_files(
+    on_disk: Dict[str, float],
+    indexed: Dict[str, float],
+    with_chunks: Dict[str, float],
+) -> Tuple[Dict[str, float], Set[str]]:
+    """Classify vault files for an incremental update.
 
-    if not documents:
+    Args:
+        on_disk: Files currently in the vault, from scan_markdown_files().
+        indexed: Files recorded by the last completed build.
+        with_chunks: Files that have chunks in the collection.
+
+    Returns:
+        Tuple of (new or modified files with their mtimes, paths of deleted
+        files whose chunks or manifest entries must be removed).
+    """
+    changed = {
+        file_path: mtime
+        for file_path, mtime in on_disk.items()
+        if indexed.get(file_path) != mtime
+    }
+    removed = (indexed.keys() | with_chunks.keys()) - on_disk.keys()
+    return changed, removed
+
+
+def build_index_full(vault_path: str, db_path: str) -> None:
+    """Build full index with progress tracking.
+
+    Args:
+        vault_path: Path to Obsidian vault.
+        db_path: Path to ChromaDB database.
+    """
+    print("Starting full index build...", file=sys.stderr)
+    print("=" * 60, file=sys.stderr)
+
+    # Step 1: Validate configuration
+    validate_configuration()
+
+    # Step 2: Find markdown files before touching the existing index
+    mtimes = scan_markdown_files(vault_path)
+
+    if not mtimes:
         print("No documents found in vault!", file=sys.stderr)
         sys.exit(1)
 
-    # Step 6: Build index (with progress bar for embedding generation)
-    print("=" * 60, file=sys.stderr)
+    # Steps 3-4: Setup embedding model and LlamaIndex settings
+    embed_model = setup_indexing_model(get_embed_dim())
+
+    # Step 5: Setup vector store (reset existing data). An empty manifest
+    # makes an interrupted build re-index every file on the next --incremental
+    chroma_collection = setup_vector_store(db_path, reset=True)
+    save_manifest(db_path, {})
+
+    # Step 6: Stream documents through chunking, embedding, and storage
+    documents = iter_documents(vault_path, mtimes)
     print("Generating embeddings and building index...", file=sys.stderr)
 
-    # Create storage context
-    storage_context = StorageContext.from_defaults(vector_store=vector_store)
+    doc_count, chunk_count = index_documents(documents, embed_model, chroma_collection)
+    save_manifest(db_path, mtimes)
 
-    index = VectorStoreIndex.from_documents(
-        documents,
-        storage_context=storage_context,
-        show_progress=True,  # Built-in progress bar
-    )
+    # Cached search results refer to the old index
+    QueryCache(db_path).clear()
 
     # Step 7: Print summary
     print("=" * 60, file=sys.stderr)
     print("Index build complete!", file=sys.stderr)
-    print(f"Documents indexed: {len(documents)}", file=sys.stderr)
+    print(f"Documents indexed: {doc_count}", file=sys.stderr)
+    print(f"Chunks indexed: {chunk_count}", file=sys.stderr)
     print(f"Database location: {os.path.abspath(db_path)}", file=sys.stderr)
     print(f"Collection name: {COLLECTION_NAME}", file=sys.stderr)
     print("=" * 60, file=sys.stderr)
 
 
+def build_index_incremental(vault_path: str, db_path: str) -> None:
+    """Update the index with files added, modified, or deleted since last run.
+
+    A file is re-indexed when its modification time differs from the one in
+    the manifest of the last completed build. Its old chunks are deleted
+    first, and the manifest is only updated once all files are indexed, so a
+    file left partially indexed by a failed run is re-indexed as a whole on
+    the next one.
+
+    Args:
+        vault_path: Path to Obsidian vault.
+        db_path: Path to ChromaDB database.
+    """
+    print("Starting incremental index update...", file=sys.stderr)
+    print("=" * 60, file=sys.stderr)
+
+    # Step 1: Validate configuration
+    validate_configuration()
+
+    # Step 2: Compare files on disk with what is indexed
+    chroma_collection = setup_vector_store(db_path, reset=False)
+    with_chunks = get_indexed_files(chroma_collection)
+    manifest = load_manifest(db_path)
+    on_disk = scan_markdown_files(vault_path)
+
+    # Indexes built before the manifest existed only know files with chunks
+    indexed = with_chunks if manifest is None else manifest
+    changed, removed = diff_files(on_disk, indexed, with_chunks)
+
+    print(f"Files in vault: {len(on_disk)}", file=sys.stderr)
+    print(f"New or modified files: {len(changed)}", file=sys.stderr)
+    print(f"Deleted files: {len(removed)}", file=sys.stderr)
+
+    if not changed and not removed:
+        if manifest is None:
+            save_manifest(db_path, on_disk)
+        print("Index is up to date", file=sys.stderr)
+        return
+
+    # Step 3: Drop stale chunks of modified and deleted files. New files are
+    # included too, in case a failed run left some of their chunks behind.
+    delete_files(chroma_collection, changed.keys() | removed)
+
+    # Step 4: Index new and modified files
+    chunk_count = 0
+    if changed:
+        print("=" * 60, file=sys.stderr)
+        # Keep the dimension the existing index was built with
+        embed_model = setup_indexing_model(get_collection_embed_dim(chroma_collection))
+
+        documents = iter_documents(vault_path, changed)
+        print("Generating embeddings and updating index...", file=sys.stderr)
+        _, chunk_count = index_documents(documents, embed_model, chroma_collection)
+    save_manifest(db_path, on_disk)
+
+    # Cached search results refer to the old index
+    QueryCache(db_path).clear()
+
+    # Step 5: Print summary
+    print("=" * 60, file=sys.stderr)
+    print("Index update complete!", file=sys.stderr)
+    print(f"Files re-indexed: {len(changed)}", file=sys.stderr)
+    print(f"Files removed: {len(removed)}", file=sys.stderr)
+    print(f"Chunks indexed: {chunk_count}", file=sys.stderr)
+    print(f"Total chunks: {chroma_collection.count()}", file=sys.stderr)
+    print("=" * 60, file=sys.stderr)
+
+
 def main() -> None:
     """Entry point with error handling."""
     try:
         args = parse_arguments()
-        build_index_full(VAULT_PATH, DB_PATH)
+        if args.incremental:
+            build_index_incremental(VAULT_PATH, DB_PATH)
+        else:
+            build_index_full(VAULT_PATH, DB_PATH)
         sys.exit(0)
     except KeyboardInterrupt:
         print("\nIndexing interrupted by user", file=sys.stderr)
@@ -0,0 +1,189 @@
+"""Query result cache for Gemini Obsidian RAG.
+
+This module caches search results so repeated or near-duplicate queries can
+skip retrieval. Exact repeats are matched by query text before the embedding
+model is loaded; paraphrases are matched by cosine similarity of the query
+embedding.
+"""
+
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from config import CACHE_DIR, get_db_key
+
+QUERY_CACHE_THRESHOLD = 0.95  # minimum cosine similarity for a semantic hit
+QUERY_CACHE_MAX_ENTRIES = 256  # oldest entries are evicted beyond this
+
+
+class CacheHit(NamedTuple):
+    """Cached results and the query they were originally computed for."""
+
+    query: str
+    results: List[Dict[str, Any]]
+
+
+class QueryCache:
+    """On-disk cache of search results for one vector database.
+
+    Entries ({query, top_k, results, ts}) and the parallel matrix of
+    normalized query embeddings are stored together in one .npz file, which
+    is replaced atomically so concurrent searches never see entries and
+    embeddings from different writers. Cached results are only valid for
+    the index they were computed against, so the indexer clears the cache
+    after every build.
+    """
+
+    def __init__(self, db_path: str, cache_dir: Path = CACHE_DIR) -> None:
+        """Initialize the cache for a database.
+
+        Args:
+            db_path: Path to the ChromaDB database the results come from.
+            cache_dir: Directory holding cache files (default: CACHE_DIR).
+        """
+        key = get_db_key(db_path)
+        self.path = Path(cache_dir) / f"qcache-{key}.npz"
+        self._entries: Optional[List[Dict[str, Any]]] = None
+        self._embeddings: Optional[np.ndarray] = None
+
+    def _load(self) -> None:
+        """Load the cache file from disk, treating an unreadable file as empty."""
+        if self._entries is not None:
+            return
+
+        self._entries = []
+        self._embeddings = None
+        try:
+            with np.load(self.path) as data:
+                entries = json.loads(data["entries"].item())
+                embeddings = data["embeddings"]
+        except (OSError, ValueError, KeyError):
+            return
+
+        if len(entries) == len(embeddings):
+            self._entries = entries
+            self._embeddings = embeddings
+
+    def _save(self) -> None:
+        """Write entries and embeddings to the cache file atomically.
+
+        Each writer uses its own temporary file, so concurrent searches
+        replace the cache as a whole and the last writer wins.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.path.parent, prefix=f".{self.path.stem}-", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(
+                    f,
+                    entries=np.array(json.dumps(self._entries, ensure_ascii=False)),
+                    embeddings=self._embeddings,
+                )
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @staticmethod
+    def _slice(entry: Dict[str, Any], top_k: int) -> Optional[CacheHit]:
+        """Return the first top_k cached results if the entry has enough."""
+        if entry["top_k"] < top_k:
+            return None
+        return CacheHit(entry["query"], entry["results"][:top_k])
+
+    def lookup_text(self, query: str, top_k: int) -> Optional[CacheHit]:
+        """Find cached results for an identical query string.
+
+        Args:
+            query: Search query string.
+            top_k: Number of results requested.
+
+        Returns:
+            Cached hit, or None on a miss.
+        """
+        self._load()
+        for entry in reversed(self._entries):
+            if entry["query"] == query:
+                hit = self._slice(entry, top_k)
+                if hit is not None:
+                    return hit
+        return None
+
+    def lookup_embedding(
+        self, embedding: List[float], top_k: int
+    ) -> Optional[CacheHit]:
+        """Find cached results for a semantically equivalent query.
+
+        Args:
+            embedding: Query embedding.
+            top_k: Number of results requested.
+
+        Returns:
+            Hit for the most similar cached query whose cosine similarity is
+            at least QUERY_CACHE_THRESHOLD, or None on a miss.
+        """
+        self._load()
+        if self._embeddings is None or self._embeddings.shape[1] != len(embedding):
+            return None
+
+        query_vector = np.asarray(embedding, dtype=np.float32)
+        query_vector /= np.linalg.norm(query_vector) or 1.0
+        similarities = self._embeddings @ query_vector
+
+        for idx in np.argsort(similarities)[::-1]:
+            if similarities[idx] < QUERY_CACHE_THRESHOLD:
+                break
+            hit = self._slice(self._entries[idx], top_k)
+            if hit is not None:
+                return hit
+        return None
+
+    def add(
+        self,
+        query: str,
+        top_k: int,
+        embedding: List[float],
+        results: List[Dict[str, Any]],
+    ) -> None:
+        """Store results for a query, evicting the oldest entries if full.
+
+        Args:
+            query: Search query string.
+            top_k: Number of results requested.
+            embedding: Query embedding.
+            results: Formatted search results.
+        """
+        self._load()
+
+        vector = np.asarray(embedding, dtype=np.float32)
+        vector /= np.linalg.norm(vector) or 1.0
+
+        if self._embeddings is None or self._embeddings.shape[1] != len(vector):
+            self._entries = []
+            self._embeddings = np.empty((0, len(vector)), dtype=np.float32)
+
+        self._entries.append(
+            {"query": query, "top_k": top_k, "results": results, "ts": time.time()}
+        )
+        self._embeddings = np.vstack([self._embeddings, vector[np.newaxis, :]])
+
+        self._entries = self._entries[-QUERY_CACHE_MAX_ENTRIES:]
+        self._embeddings = self._embeddings[-QUERY_CACHE_MAX_ENTRIES:]
+        self._save()
+
+    def clear(self) -> None:
+        """Delete all cached results."""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+        self._entries = None
+        self._embeddings = None
@@ -6,17 +6,17 @@ ChromaDB and returns results in JSON format for LLM consumption.
 Usage:
     python3 search.py "your search query"
     python3 search.py "your search query" --top-k 10
+    python3 search.py "your search query" --no-cache
 """
 
 import sys
 import json
 import argparse
+import socket
+import subprocess
 import time
-from typing import Dict, Any, List
-
-from llama_index.core import VectorStoreIndex, Settings
-from llama_index.vector_stores.chroma import ChromaVectorStore
-import chromadb
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
 
 from config import (
     DB_PATH,
@@ -24,9 +24,27 @@ from config import (
     CHUNK_SIZE,
     CHUNK_OVERLAP,
     DEFAULT_TOP_K,
+    SEARCH_SERVER,
+    SEARCH_SERVER_TIMEOUT,
     validate_configuration,
+    get_collection_embed_dim,
+    get_search_socket_path,
     setup_embedding_model,
 )
+from query_cache import CacheHit, QueryCache
+
+# orjson is optional: it serializes large result payloads several times faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# LlamaIndex and ChromaDB are imported lazily: queries answered by the search
+# server or the exact-match cache never need them.
+if TYPE_CHECKING:
+    import chromadb
+    from llama_index.core import VectorStoreIndex
+    from llama_index.vector_stores.chroma import ChromaVectorStore
 
 
 def parse_arguments() -> argparse.Namespace:
@@ -45,22 +63,32 @@ def parse_arguments() -> argparse.Namespace:
         default=DEFAULT_TOP_K,
         help=f"Number of results to return (default: {DEFAULT_TOP_K})",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the query result cache",
+    )
 
     return parser.parse_args()
 
 
-def load_vector_store(db_path: str) -> ChromaVectorStore:
+def load_vector_store(
+    db_path: str,
+) -> Tuple["chromadb.Collection", "ChromaVectorStore"]:
     """Load existing ChromaDB vector store.
 
     Args:
         db_path: Path to ChromaDB database directory.
 
     Returns:
-        ChromaVectorStore instance.
+        Tuple of (ChromaDB collection, ChromaVectorStore instance).
 
     Raises:
         Exception: If database or collection not found.
     """
+    import chromadb
+    from llama_index.vector_stores.chroma import ChromaVectorStore
+
     # Create persistent ChromaDB client
     chroma_client = chromadb.PersistentClient(path=db_path)
 
@@ -70,41 +98,109 @@ def load_vector_store(db_path: str) -> ChromaVectorStore:
     # Create vector store
     vector_store = ChromaVectorStore(chroma_collection=chroma_collection)
 
-    return vector_store
+    return chroma_collection, vector_store
+
 
+def load_index(db_path: str) -> "VectorStoreIndex":
+    """Load the embedding model and the index stored in ChromaDB.
+
+    Args:
+        db_path: Path to ChromaDB database directory.
+
+    Returns:
+        VectorStoreIndex backed by the existing collection.
+    """
+    from llama_index.core import VectorStoreIndex, Settings
 
-def search_vault(query: str, top_k: int) -> Dict[str, Any]:
+    # Step 1: Load vector store
+    chroma_collection, vector_store = load_vector_store(db_path)
+
+    # Step 2: Setup embedding model, truncated like the stored embeddings
+    embed_dim = get_collection_embed_dim(chroma_collection)
+    embed_model = setup_embedding_model(verbose=False, embed_dim=embed_dim)
+
+    # Step 3: Configure Settings
+    Settings.embed_model = embed_model
+    Settings.chunk_size = CHUNK_SIZE
+    Settings.chunk_overlap = CHUNK_OVERLAP
+
+    # Step 4: Create index from existing vector store
+    return VectorStoreIndex.from_vector_store(vector_store)
+
+
+def _cached_response(query: str, hit: CacheHit, start_time: float) -> Dict[str, Any]:
+    """Build a search response from cached results.
+
+    Args:
+        query: Search query string.
+        hit: Cached results and the query they were computed for.
+        start_time: Time the search started.
+
+    Returns:
+        Dictionary in the same format as search_vault, marked as cached and
+        naming the cached query (which differs for paraphrase matches).
+    """
+    elapsed_time = time.time() - start_time
+    return {
+        "query": query,
+        "results": hit.results,
+        "count": len(hit.results),
+        "cached": True,
+        "cached_query": hit.query,
+        "elapsed_time_seconds": round(elapsed_time, 3),
+    }
+
+
+def search_vault(
+    query: str,
+    top_k: int,
+    use_cache: bool = True,
+    index: Optional["VectorStoreIndex"] = None,
+) -> Dict[str, Any]:
     """Perform semantic search and return results as dict.
 
+    Identical queries are answered from the cache before the embedding model
+    is loaded; near-duplicate queries are answered after embedding, skipping
+    retrieval. Cache hits are marked with "cached": true and "cached_query",
+    the query the results were originally computed for.
+
     Args:
         query: Search query string.
         top_k: Number of top results to return.
+        use_cache: If True, read from and write to the query cache.
+        index: Already loaded index to search (default: load from DB_PATH).
 
     Returns:
         Dictionary containing query, results, count, and elapsed time.
     """
     start_time = time.time()
+    cache = QueryCache(DB_PATH) if use_cache else None
 
     try:
-        # Step 1: Setup embedding model
-        embed_model = setup_embedding_model(verbose=False)
+        # Step 0: Exact-match cache lookup (no model load needed)
+        cached = cache.lookup_text(query, top_k) if cache else None
+        if cached is not None:
+            return _cached_response(query, cached, start_time)
 
-        # Step 2: Configure Settings
-        Settings.embed_model = embed_model
-        Settings.chunk_size = CHUNK_SIZE
-        Settings.chunk_overlap = CHUNK_OVERLAP
+        from llama_index.core import Settings
+        from llama_index.core.schema import QueryBundle
 
-        # Step 3: Load vector store
-        vector_store = load_vector_store(DB_PATH)
-
-        # Step 4: Create index from existing vector store
-        index = VectorStoreIndex.from_vector_store(vector_store)
+        # Steps 1-4: Load embedding model and index unless already loaded
+        if index is None:
+            index = load_index(DB_PATH)
 
         # Step 5: Use retriever instead of query engine to avoid LLM requirement
         retriever = index.as_retriever(similarity_top_k=top_k)
 
-        # Step 6: Execute retrieval
-        nodes = retriever.retrieve(query)
+        # Step 6: Embed query once, check semantic cache, then retrieve
+        query_embedding = Settings.embed_model.get_query_embedding(query)
+        cached = cache.lookup_embedding(query_embedding, top_k) if cache else None
+        if cached is not None:
+            return _cached_response(query, cached, start_time)
+
+        nodes = retriever.retrieve(
+            QueryBundle(query_str=query, embedding=query_embedding)
+        )
 
         # Step 7: Format results
         results = []
@@ -124,6 +220,12 @@ def search_vault(query: str, top_k: int) -> Dict[str, Any]:
 
             results.append(result_item)
 
+        if cache:
+            try:
+                cache.add(query, top_k, query_embedding, results)
+            except OSError as e:
+                print(f"Warning: could not update query cache: {e}", file=sys.stderr)
+
         elapsed_time = time.time() - start_time
         return {
             "query": query,
@@ -152,6 +254,69 @@ def search_vault(query: str, top_k: int) -> Dict[str, Any]:
         }
 
 
+def search_via_server(
+    query: str, top_k: int, use_cache: bool = True
+) -> Optional[Dict[str, Any]]:
+    """Send the query to the search server running for DB_PATH.
+
+    Args:
+        query: Search query string.
+        top_k: Number of top results to return.
+        use_cache: If True, let the server use the query cache.
+
+    Returns:
+        Result dictionary from the server, or None if no server is reachable.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+
+    # Each database has its own server, so DB_PATH picks the socket
+    socket_path = get_search_socket_path(DB_PATH)
+    if not socket_path.exists():
+        return None
+
+    request = {"query": query, "top_k": top_k, "use_cache": use_cache}
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(SEARCH_SERVER_TIMEOUT)
+            sock.connect(str(socket_path))
+            sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as response:
+                return json.loads(response.readline())
+    except (OSError, ValueError):
+        # Stale socket, server busy loading, or malformed reply
+        return None
+
+
+def start_search_server() -> None:
+    """Start search_server.py in the background, detached from this process."""
+    if not hasattr(socket, "AF_UNIX"):
+        return
+
+    server_script = Path(__file__).resolve().with_name("search_server.py")
+    subprocess.Popen(
+        [sys.executable, str(server_script)],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def write_json(result: Dict[str, Any]) -> None:
+    """Write a result as indented JSON to stdout.
+
+    Args:
+        result: Dictionary to serialize.
+    """
+    if orjson is not None:
+        sys.stdout.buffer.write(orjson.dumps(result, option=orjson.OPT_INDENT_2))
+        sys.stdout.buffer.write(b"\n")
+        sys.stdout.buffer.flush()
+    else:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
 def main() -> None:
     """Entry point - always output JSON to stdout."""
     try:
@@ -161,11 +326,16 @@ def main() -> None:
         # Parse arguments
         args = parse_arguments()
 
-        # Perform search
-        result = search_vault(args.query, args.top_k)
+        # Perform search, preferring a running search server
+        use_cache = not args.no_cache
+        result = search_via_server(args.query, args.top_k, use_cache)
+        if result is None:
+            if SEARCH_SERVER:
+                start_search_server()
+            result = search_vault(args.query, args.top_k, use_cache)
 
         # Output JSON to stdout
-        print(json.dumps(result, indent=2, ensure_ascii=False))
+        write_json(result)
 
     except KeyboardInterrupt:
         # Even for interrupts, output valid JSON
@@ -175,7 +345,7 @@ def main() -> None:
             "results": [],
             "count": 0,
         }
-        print(json.dumps(result, indent=2, ensure_ascii=False))
+        write_json(result)
         sys.exit(1)
     except Exception as e:
         # Catch-all: output error as JSON
@@ -185,7 +355,7 @@ def main() -> None:
             "results": [],
             "count": 0,
         }
-        print(json.dumps(result, indent=2, ensure_ascii=False))
+        write_json(result)
         sys.exit(1)
 
 
@@ -0,0 +1,182 @@
+"""Search server for Gemini Obsidian RAG.
+
+This script keeps the embedding model and vector index loaded in memory and
+answers search requests over a UNIX socket, so search.py queries skip model
+loading. search.py uses the server automatically when it is running, and
+starts it on demand when SEARCH_SERVER=1 is set.
+
+The server serves the database at DB_PATH on a socket named after that path,
+so servers for different databases never answer each other's queries. It
+reloads the index after each indexer run and exits after
+SEARCH_SERVER_IDLE_TIMEOUT seconds without requests.
+
+Usage:
+    python3 search_server.py
+
+Protocol:
+    One JSON request per connection, terminated by a newline:
+    {"query": "...", "top_k": 5, "use_cache": true}
+    The reply is the search_vault() result as a single JSON line.
+"""
+
+import sys
+import os
+import json
+import socket
+import socketserver
+from typing import Any, Dict, Optional
+
+from config import (
+    DB_PATH,
+    DEFAULT_TOP_K,
+    MANIFEST_FILE,
+    SEARCH_SERVER_IDLE_TIMEOUT,
+    validate_configuration,
+    get_search_socket_path,
+)
+from search import load_index, search_vault
+
+
+def _db_version(db_path: str) -> float:
+    """Return the modification time of the database's indexed-files manifest.
+
+    The indexer rewrites the manifest at the end of every build, while
+    merely opening the database (as the server does) touches ChromaDB's own
+    files, so only the manifest reliably tells when to reload the index.
+
+    Args:
+        db_path: Path to ChromaDB database directory.
+
+    Returns:
+        Manifest mtime, or 0.0 if the database has no manifest.
+    """
+    try:
+        return os.stat(os.path.join(db_path, MANIFEST_FILE)).st_mtime
+    except FileNotFoundError:
+        return 0.0
+
+
+class SearchRequestHandler(socketserver.StreamRequestHandler):
+    """Handle one JSON search request per connection."""
+
+    def handle(self) -> None:
+        """Read a request line, run the search, and write the JSON reply."""
+        try:
+            request = json.loads(self.rfile.readline())
+            result = self.server.search(
+                str(request["query"]),
+                int(request.get("top_k", DEFAULT_TOP_K)),
+                bool(request.get("use_cache", True)),
+            )
+        except (ValueError, KeyError, TypeError) as e:
+            result = {
+                "query": "",
+                "error": f"Invalid request: {str(e)}",
+                "results": [],
+                "count": 0,
+            }
+
+        reply = json.dumps(result, ensure_ascii=False).encode("utf-8")
+        self.wfile.write(reply + b"\n")
+
+
+class SearchServer(socketserver.UnixStreamServer):
+    """UNIX socket server holding a loaded index between requests."""
+
+    timeout = SEARCH_SERVER_IDLE_TIMEOUT
+
+    def __init__(self, socket_path: str, db_path: str) -> None:
+        """Bind the socket.
+
+        Args:
+            socket_path: Path of the UNIX socket to listen on.
+            db_path: Path to ChromaDB database directory.
+        """
+        super().__init__(socket_path, SearchRequestHandler)
+        self.db_path = db_path
+        self.idle = False
+        self._index = None
+        self._db_version: Optional[float] = None
+
+    def refresh_index(self) -> None:
+        """Load the index if it is missing or the database changed on disk."""
+        version = _db_version(self.db_path)
+        if self._index is not None and version == self._db_version:
+            return
+
+        # ChromaDB reuses one in-memory system per database path, which would
+        # keep serving the segments loaded before the indexer rewrote them
+        from chromadb.api.client import SharedSystemClient
+
+        self._index = None
+        try:
+            SharedSystemClient.clear_system_cache()
+            self._index = load_index(self.db_path)
+            self._db_version = version
+        except Exception:
+            # Let search_vault report the error in its usual JSON format
+            pass
+
+    def search(self, query: str, top_k: int, use_cache: bool) -> Dict[str, Any]:
+        """Search using the loaded index, reloading it if the database changed.
+
+        Args:
+            query: Search query string.
+            top_k: Number of top results to return.
+            use_cache: If True, read from and write to the query cache.
+
+        Returns:
+            Dictionary in the same format as search.search_vault.
+        """
+        self.refresh_index()
+        return search_vault(query, top_k, use_cache, index=self._index)
+
+    def handle_timeout(self) -> None:
+        """Mark the server idle so the main loop exits."""
+        self.idle = True
+
+
+def _server_running(socket_path: str) -> bool:
+    """Check whether another server is already listening on socket_path."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(socket_path)
+        return True
+    except OSError:
+        return False
+
+
+def main() -> None:
+    """Entry point - serve until idle timeout or interrupt."""
+    validate_configuration()
+
+    socket_path = get_search_socket_path(DB_PATH)
+    if _server_running(str(socket_path)):
+        print(f"Search server already running on: {socket_path}", file=sys.stderr)
+        sys.exit(0)
+
+    # Remove a stale socket left behind by a server that did not shut down
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+
+    server = SearchServer(str(socket_path), DB_PATH)
+    print(f"Search server listening on: {socket_path}", file=sys.stderr)
+
+    # Load the model up front so the first query does not pay for it
+    server.refresh_index()
+
+    try:
+        while not server.idle:
+            server.handle_request()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        print("Search server stopped", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Tests for model input helpers in config.py."""
+
+import functools
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+import torch
+
+import config
+from config import (
+    CACHE_DIR,
+    SEQUENCE_BUCKETS,
+    _pad_to_bucket,
+    get_search_socket_path,
+    setup_embedding_model,
+    validate_configuration,
+)
+
+
+def _features(length: int) -> dict:
+    return {
+        "input_ids": torch.ones((2, length), dtype=torch.long),
+        "attention_mask": torch.ones((2, length), dtype=torch.long),
+    }
+
+
+def _tokenizer(padding_side: str) -> SimpleNamespace:
+    return SimpleNamespace(padding_side=padding_side, pad_token_id=0)
+
+
+def test_pad_to_bucket_pads_right() -> None:
+    features = _pad_to_bucket(_features(20), _tokenizer("right"))
+
+    assert features["input_ids"].shape == (2, 32)
+    assert features["attention_mask"][0, :20].tolist() == [1] * 20
+    assert features["attention_mask"][0, 20:].tolist() == [0] * 12
+
+
+def test_pad_to_bucket_pads_left() -> None:
+    features = _pad_to_bucket(_features(20), _tokenizer("left"))
+
+    assert features["input_ids"].shape == (2, 32)
+    assert features["input_ids"][0, :12].tolist() == [0] * 12
+    assert features["attention_mask"][0, 12:].tolist() == [1] * 20
+
+
+def test_pad_to_bucket_keeps_exact_and_oversized_lengths() -> None:
+    largest = SEQUENCE_BUCKETS[-1]
+
+    exact = _pad_to_bucket(_features(largest), _tokenizer("right"))
+    oversized = _pad_to_bucket(_features(largest + 1), _tokenizer("right"))
+
+    assert exact["input_ids"].shape == (2, largest)
+    assert oversized["input_ids"].shape == (2, largest + 1)
+
+
+def test_search_socket_is_per_database() -> None:
+    socket_path = get_search_socket_path("./chroma_db")
+
+    assert socket_path.parent == CACHE_DIR
+    assert socket_path == get_search_socket_path(str(Path("chroma_db").resolve()))
+    assert socket_path != get_search_socket_path("./other_db")
+
+
+@pytest.mark.parametrize("embed_dim", ["abc", "300", ""])
+def test_invalid_embed_dim_is_a_configuration_error(
+    embed_dim: str, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys
+) -> None:
+    monkeypatch.setattr(config, "VAULT_PATH", str(tmp_path))
+    monkeypatch.setattr(config, "HF_TOKEN", "token")
+    monkeypatch.setattr(config, "EMBED_DIM", embed_dim)
+
+    with pytest.raises(SystemExit):
+        validate_configuration()
+
+    assert "EMBED_DIM must be one of" in capsys.readouterr().err
+
+
+def test_valid_embed_dim(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(config, "VAULT_PATH", str(tmp_path))
+    monkeypatch.setattr(config, "HF_TOKEN", "token")
+    monkeypatch.setattr(config, "EMBED_DIM", "512")
+
+    validate_configuration()
+
+    assert config.get_embed_dim() == 512
+
+
+def test_setup_embedding_model_reports_reuse(
+    monkeypatch: pytest.MonkeyPatch, capsys
+) -> None:
+    @functools.lru_cache(maxsize=1)
+    def load(embed_dim):
+        return object(), ("Embedding dimensions: 256",)
+
+    monkeypatch.setattr(config, "_load_embedding_model", load)
+
+    first = setup_embedding_model(verbose=True, embed_dim=256)
+    loaded_output = capsys.readouterr().err
+    second = setup_embedding_model(verbose=True, embed_dim=256)
+    reused_output = capsys.readouterr().err
+
+    assert first is second
+    assert "Loaded embedding model" in loaded_output
+    assert "Embedding dimensions: 256" in loaded_output
+    assert "Reusing loaded embedding model" in reused_output
+    assert "Loaded embedding model" not in reused_output
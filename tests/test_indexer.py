@@ -0,0 +1,172 @@
+"""Tests for vault scanning and incremental change detection in indexer.py."""
+
+import os
+from pathlib import Path
+
+import pytest
+from llama_index.core import MockEmbedding
+from llama_index.core.vector_stores import VectorStoreQuery
+from llama_index.vector_stores.chroma import ChromaVectorStore
+
+import indexer
+from indexer import (
+    diff_files,
+    index_documents,
+    iter_documents,
+    load_manifest,
+    save_manifest,
+    scan_markdown_files,
+)
+
+
+class RecordingCollection:
+    """Collection wrapper recording the size of every add() call."""
+
+    def __init__(self, collection: object) -> None:
+        self.collection = collection
+        self.batch_sizes = []
+
+    def add(self, **kwargs: object) -> None:
+        self.batch_sizes.append(len(kwargs["ids"]))
+        self.collection.add(**kwargs)
+
+
+def _write(path: Path, text: str = "# Note\n\nSome text.\n") -> str:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return os.path.abspath(path)
+
+
+def test_scan_skips_hidden_files_and_directories(tmp_path: Path) -> None:
+    note = _write(tmp_path / "note.md")
+    nested = _write(tmp_path / "folder" / "nested.md")
+    _write(tmp_path / ".hidden.md")
+    _write(tmp_path / ".obsidian" / "workspace.md")
+    _write(tmp_path / "folder" / "image.png", "not markdown")
+
+    mtimes = scan_markdown_files(str(tmp_path))
+
+    assert set(mtimes) == {note, nested}
+    assert mtimes[note] == os.stat(note).st_mtime
+
+
+def test_scan_does_not_follow_symlinked_directories(tmp_path: Path) -> None:
+    note = _write(tmp_path / "folder" / "note.md")
+    os.symlink(tmp_path, tmp_path / "folder" / "loop")
+
+    assert set(scan_markdown_files(str(tmp_path))) == {note}
+
+
+def test_empty_note_produces_no_documents(tmp_path: Path) -> None:
+    empty = _write(tmp_path / "empty.md", "")
+
+    documents = list(iter_documents(str(tmp_path), {empty: 1.0}))
+
+    # Such files never get chunks, which is why the manifest tracks them
+    assert documents == []
+
+
+def test_iter_documents_sets_modified_time(tmp_path: Path) -> None:
+    note = _write(tmp_path / "note.md")
+    empty = _write(tmp_path / "empty.md", "")
+
+    documents = list(iter_documents(str(tmp_path), {note: 1.5, empty: 2.5}))
+
+    assert documents
+    assert {doc.metadata["modified_time"] for doc in documents} == {1.5}
+
+
+def test_index_documents_stores_nodes_for_chroma_vector_store(
+    tmp_path: Path,
+) -> None:
+    vault = tmp_path / "vault"
+    notes = [_write(vault / f"note{i}.md", f"Plain text {i}.\n") for i in range(3)]
+    _write(vault / "empty.md", "")
+    mtimes = scan_markdown_files(str(vault))
+    collection = indexer.setup_vector_store(str(tmp_path / "db"), reset=True)
+    recording = RecordingCollection(collection)
+
+    doc_count, chunk_count = index_documents(
+        iter_documents(str(vault), mtimes),
+        MockEmbedding(embed_dim=8),
+        recording,
+        batch_size=2,
+    )
+
+    assert (doc_count, chunk_count) == (3, 3)
+    assert recording.batch_sizes == [2, 1]
+    assert collection.count() == 3
+
+    stored = collection.get(include=["metadatas"])
+    for metadata in stored["metadatas"]:
+        assert "_node_content" in metadata
+        # ChromaDB may round the last digit of stored floats
+        assert metadata["modified_time"] == pytest.approx(
+            mtimes[metadata["file_path"]]
+        )
+
+    # Search reads the collection back through ChromaVectorStore
+    result = ChromaVectorStore(chroma_collection=collection).query(
+        VectorStoreQuery(query_embedding=[0.5] * 8, similarity_top_k=3)
+    )
+    assert sorted(node.metadata["file_path"] for node in result.nodes) == notes
+    assert all(node.get_content().startswith("Plain text") for node in result.nodes)
+
+
+def test_diff_files_classifies_new_modified_and_removed() -> None:
+    on_disk = {"/v/same.md": 1.0, "/v/modified.md": 3.0, "/v/new.md": 1.0}
+    indexed = {"/v/same.md": 1.0, "/v/modified.md": 2.0, "/v/deleted.md": 1.0}
+
+    changed, removed = diff_files(on_disk, indexed, indexed)
+
+    assert changed == {"/v/modified.md": 3.0, "/v/new.md": 1.0}
+    assert removed == {"/v/deleted.md"}
+
+
+def test_diff_files_ignores_recorded_files_without_chunks() -> None:
+    on_disk = {"/v/note.md": 1.0, "/v/empty.md": 1.0}
+    manifest = dict(on_disk)
+    with_chunks = {"/v/note.md": 1.0}
+
+    assert diff_files(on_disk, manifest, with_chunks) == ({}, set())
+
+
+def test_diff_files_removes_chunks_missing_from_manifest() -> None:
+    # A failed full build leaves chunks behind with an empty manifest
+    changed, removed = diff_files({}, {}, {"/v/deleted.md": 1.0})
+
+    assert changed == {}
+    assert removed == {"/v/deleted.md"}
+
+
+def test_manifest_round_trip(tmp_path: Path) -> None:
+    assert load_manifest(str(tmp_path)) is None
+
+    save_manifest(str(tmp_path), {"/v/note.md": 1.5})
+
+    assert load_manifest(str(tmp_path)) == {"/v/note.md": 1.5}
+    assert os.listdir(tmp_path) == [indexer.MANIFEST_FILE]
+
+
+def test_manifest_unreadable_is_ignored(tmp_path: Path) -> None:
+    (tmp_path / indexer.MANIFEST_FILE).write_text("not json", encoding="utf-8")
+
+    assert load_manifest(str(tmp_path)) is None
+
+
+def test_incremental_skips_model_load_for_empty_notes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    vault = tmp_path / "vault"
+    db_path = str(tmp_path / "db")
+    _write(vault / "empty.md", "")
+    indexer.setup_vector_store(db_path, reset=True)
+    save_manifest(db_path, scan_markdown_files(str(vault)))
+
+    def fail(*args: object, **kwargs: object) -> None:
+        raise AssertionError("embedding model must not be loaded")
+
+    monkeypatch.setattr(indexer, "validate_configuration", lambda: None)
+    monkeypatch.setattr(indexer, "setup_indexing_model", fail)
+
+    indexer.build_index_incremental(str(vault), db_path)
@@ -0,0 +1,93 @@
+"""Tests for the on-disk query cache."""
+
+from pathlib import Path
+
+import query_cache
+from query_cache import CacheHit, QueryCache
+
+DB_PATH = "/tmp/vault-db"
+
+
+def _results(name: str) -> list:
+    return [{"file_path": f"{name}.md", "score": 1.0}]
+
+
+def test_text_hit_and_miss(tmp_path: Path) -> None:
+    QueryCache(DB_PATH, tmp_path).add("alpha", 5, [1.0, 0.0], _results("a"))
+    cache = QueryCache(DB_PATH, tmp_path)
+
+    assert cache.lookup_text("alpha", 3).results == _results("a")
+    assert cache.lookup_text("beta", 3) is None
+    # More results than were cached cannot be served
+    assert cache.lookup_text("alpha", 10) is None
+
+
+def test_embedding_hit_and_miss(tmp_path: Path) -> None:
+    QueryCache(DB_PATH, tmp_path).add("alpha", 5, [1.0, 0.0], _results("a"))
+    cache = QueryCache(DB_PATH, tmp_path)
+
+    assert cache.lookup_embedding([0.99, 0.01], 5) == CacheHit("alpha", _results("a"))
+    assert cache.lookup_embedding([0.0, 1.0], 5) is None
+
+
+def test_databases_do_not_share_entries(tmp_path: Path) -> None:
+    QueryCache(DB_PATH, tmp_path).add("alpha", 5, [1.0, 0.0], _results("a"))
+
+    assert QueryCache("/tmp/other-db", tmp_path).lookup_text("alpha", 5) is None
+
+
+def test_oldest_entries_are_evicted(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(query_cache, "QUERY_CACHE_MAX_ENTRIES", 2)
+    cache = QueryCache(DB_PATH, tmp_path)
+    for name in ("a", "b", "c"):
+        cache.add(name, 5, [1.0, 0.0], _results(name))
+
+    reloaded = QueryCache(DB_PATH, tmp_path)
+    assert reloaded.lookup_text("a", 5) is None
+    assert reloaded.lookup_text("c", 5).results == _results("c")
+
+
+def test_dimension_change_resets_cache(tmp_path: Path) -> None:
+    cache = QueryCache(DB_PATH, tmp_path)
+    cache.add("alpha", 5, [1.0, 0.0], _results("a"))
+    cache.add("beta", 5, [0.0, 0.0, 1.0], _results("b"))
+
+    reloaded = QueryCache(DB_PATH, tmp_path)
+    assert reloaded.lookup_text("alpha", 5) is None
+    assert reloaded.lookup_embedding([1.0, 0.0], 5) is None
+    assert reloaded.lookup_embedding([0.0, 0.0, 1.0], 5).results == _results("b")
+
+
+def test_interleaved_writers_keep_entries_and_embeddings_paired(
+    tmp_path: Path, monkeypatch
+) -> None:
+    first = QueryCache(DB_PATH, tmp_path)
+    second = QueryCache(DB_PATH, tmp_path)
+    replace = query_cache.os.replace
+    calls = []
+
+    def replace_with_concurrent_writer(src, dst):
+        # The second process saves while the first is installing its files
+        calls.append(dst)
+        if len(calls) == 1:
+            second.add("beta", 5, [0.0, 1.0], _results("b"))
+        replace(src, dst)
+
+    monkeypatch.setattr(query_cache.os, "replace", replace_with_concurrent_writer)
+    first.add("alpha", 5, [1.0, 0.0], _results("a"))
+
+    reloaded = QueryCache(DB_PATH, tmp_path)
+    assert reloaded.lookup_text("alpha", 5).results == _results("a")
+    assert reloaded.lookup_embedding([1.0, 0.0], 5).results == _results("a")
+    assert reloaded.lookup_embedding([0.0, 1.0], 5) is None
+    assert [path.name for path in tmp_path.iterdir()] == [reloaded.path.name]
+
+
+def test_clear_removes_cache_file(tmp_path: Path) -> None:
+    cache = QueryCache(DB_PATH, tmp_path)
+    cache.add("alpha", 5, [1.0, 0.0], _results("a"))
+
+    cache.clear()
+
+    assert list(tmp_path.iterdir()) == []
+    assert QueryCache(DB_PATH, tmp_path).lookup_text("alpha", 5) is None
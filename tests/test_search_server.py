@@ -0,0 +1,50 @@
+"""Tests for index reloading in search_server.py."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+import search_server
+from config import MANIFEST_FILE
+from search_server import SearchServer
+
+
+@pytest.fixture
+def server(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    db_path = tmp_path / "db"
+    db_path.mkdir()
+    (db_path / MANIFEST_FILE).write_text("{}", encoding="utf-8")
+    loads = []
+
+    def load_index(path: str) -> object:
+        # Opening ChromaDB touches its SQLite file, which must not count as a change
+        (Path(path) / "chroma.sqlite3").touch()
+        loads.append(path)
+        return object()
+
+    monkeypatch.setattr(search_server, "load_index", load_index)
+    monkeypatch.setattr(search_server, "search_vault", lambda *args, **kwargs: {})
+
+    server = SearchServer(str(tmp_path / "search.sock"), str(db_path))
+    server.loads = loads
+    yield server
+    server.server_close()
+
+
+def test_unchanged_database_loads_index_once(server: SearchServer) -> None:
+    server.search("first", 5, True)
+    server.search("second", 5, True)
+
+    assert len(server.loads) == 1
+
+
+def test_new_build_reloads_index(server: SearchServer) -> None:
+    server.search("first", 5, True)
+    manifest = os.path.join(server.db_path, MANIFEST_FILE)
+    mtime = os.stat(manifest).st_mtime + 10
+    os.utime(manifest, (mtime, mtime))
+
+    server.search("second", 5, True)
+
+    assert len(server.loads) == 2